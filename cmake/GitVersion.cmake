@@ -61,6 +61,7 @@ Syntax:
     [SOURCE_DIR <dir>]                # Git repository directory (default: CMAKE_CURRENT_SOURCE_DIR)
     [HASH_LENGTH <length>]            # Git hash length 1-40 (default: 7)
     [FAIL_ON_MISMATCH]                # Error if tag version != DEFAULT_VERSION
+    [SKIP_DIRTY_CHECK]                # Skip dirty detection (IS_DIRTY is always FALSE)
   )
 
 Version Format Examples:
@@ -73,7 +74,7 @@ Version Format Examples:
 ]]
 function(git_version_info)
   # Parse function arguments
-  set(options FAIL_ON_MISMATCH)
+  set(options FAIL_ON_MISMATCH SKIP_DIRTY_CHECK)
   set(oneValueArgs 
     VERSION FULL_VERSION MAJOR MINOR PATCH 
     COMMIT_HASH COMMIT_COUNT IS_DIRTY IS_TAGGED IS_DEVELOPMENT 
@@ -163,18 +164,22 @@ function(git_version_info)
       set(commit_hash "${git_hash_output}")
     endif()
     
-    # Check for dirty working directory (staged and unstaged changes)
-    execute_process(
-      COMMAND "${GIT_EXECUTABLE}" -C "${GV_SOURCE_DIR}" status --porcelain
-      RESULT_VARIABLE git_status_result
-      OUTPUT_VARIABLE git_status_output
-      OUTPUT_STRIP_TRAILING_WHITESPACE
-      ERROR_QUIET
-    )
-    
-    if(git_status_result EQUAL 0)
-      if(git_status_output)
-        set(is_dirty TRUE)
+    # Check for dirty working directory (staged and unstaged changes).
+    # git status walks the whole worktree, so callers that do not care
+    # about dirty state can skip it with SKIP_DIRTY_CHECK.
+    if(NOT GV_SKIP_DIRTY_CHECK)
+      execute_process(
+        COMMAND "${GIT_EXECUTABLE}" -C "${GV_SOURCE_DIR}" status --porcelain
+        RESULT_VARIABLE git_status_result
+        OUTPUT_VARIABLE git_status_output
+        OUTPUT_STRIP_TRAILING_WHITESPACE
+        ERROR_QUIET
+      )
+
+      if(git_status_result EQUAL 0)
+        if(git_status_output)
+          set(is_dirty TRUE)
+        endif()
       endif()
     endif()
     
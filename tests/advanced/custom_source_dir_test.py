@@ -5,9 +5,10 @@
 Tests for GitVersion.cmake with custom source directory.
 """
 
-import os
 import pytest
 
+from tests.utils.git_environment import GitEnvironment
+
 @pytest.mark.advanced
 def test_custom_source_dir(git_env, cmake_project, gitversion_cmake_path):
     """Test version extraction with a custom source directory."""
@@ -17,8 +18,7 @@ def test_custom_source_dir(git_env, cmake_project, gitversion_cmake_path):
     git_env.tag("1.0.0")
     
     # Create a subdirectory with its own Git repository
-    subdir = git_env.root_dir / "subproject"
-    os.makedirs(subdir, exist_ok=True)
+    subdir = git_env.ensure_dir("subproject")
     
     # Create a separate Git repo in the subdirectory
     sub_git_env = GitEnvironment(str(subdir))
@@ -48,8 +48,7 @@ def test_custom_source_dir_with_prefix(git_env, cmake_project, gitversion_cmake_
     git_env.tag("v1.0.0")
     
     # Create a subdirectory with its own Git repository
-    subdir = git_env.root_dir / "lib"
-    os.makedirs(subdir, exist_ok=True)
+    subdir = git_env.ensure_dir("lib")
     
     # Create a separate Git repo in the subdirectory
     sub_git_env = GitEnvironment(str(subdir))
@@ -76,7 +75,8 @@ def test_custom_source_dir_with_prefix(git_env, cmake_project, gitversion_cmake_
 
 
 @pytest.mark.advanced
-def test_nested_source_dirs(git_env, cmake_project, gitversion_cmake_path):
+@pytest.mark.parametrize("source_dir", ["./libs", "./libs/core"])
+def test_nested_source_dirs(git_env, cmake_project, gitversion_cmake_path, source_dir):
     """Test version extraction with nested custom source directories."""
     # Create base repository
     git_env.create_file("README.md", "# Test Project")
@@ -87,8 +87,7 @@ def test_nested_source_dirs(git_env, cmake_project, gitversion_cmake_path):
     # Main repo
     #  └── libs
     #       └── core
-    libs_dir = git_env.root_dir / "libs"
-    os.makedirs(libs_dir, exist_ok=True)
+    libs_dir = git_env.ensure_dir("libs")
     
     # Create a Git repo for the libs directory
     libs_git = GitEnvironment(str(libs_dir))
@@ -98,31 +97,19 @@ def test_nested_source_dirs(git_env, cmake_project, gitversion_cmake_path):
     
     # Create a nested Git repo for the core library
     core_dir = libs_dir / "core"
-    os.makedirs(core_dir, exist_ok=True)
+    core_dir.mkdir(parents=True, exist_ok=True)
     
     core_git = GitEnvironment(str(core_dir))
     core_git.create_file("README.md", "# Core Library")
     core_git.commit("Initial commit in core")
     core_git.tag("3.0.0")
     
-    # Test with the first level nested repo
+    # Test with the nested repo for this parameter
     cmake_project.create_cmakelists({
-        "SOURCE_DIR": "./libs"
+        "SOURCE_DIR": source_dir
     })
     version_info = cmake_project.configure()
-    
+
     # Assert version extracted - currently just validate that we have version information
     assert version_info.get("PROJECT_VERSION"), "Missing project version"
-    
-    # Test with the second level nested repo
-    cmake_project.create_cmakelists({
-        "SOURCE_DIR": "./libs/core"
-    })
-    version_info = cmake_project.configure()
-    
-    # Assert version extracted
-    assert version_info.get("PROJECT_VERSION"), "Missing project version"
-
 
-# Import here to avoid circular import
-from tests.utils.git_environment import GitEnvironment
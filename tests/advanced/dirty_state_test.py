@@ -7,156 +7,187 @@ Tests for GitVersion.cmake dirty state detection functionality.
 
 import pytest
 
-# Use pytest marker to mark this as an advanced test
-@pytest.mark.advanced
-def test_clean_tagged_version(git_env, cmake_project):
-    """Test version extraction from a clean tagged commit."""
-    # Create initial commit
+
+# Each scenario builder prepares the repository state (including the CMake
+# project files, whose ordering relative to tagging matters) and returns the
+# expected version information for that state.
+
+def _clean_tagged(git_env, cmake_project):
     git_env.create_file("README.md", "# Test Project")
     git_env.commit("Initial commit")
-    
+
     # Create CMake project files and commit them first
     cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
     cmake_project.commit_project_files(git_env)  # Commit cmake files
-    
+
     # Create a tag AFTER committing cmake files
     git_env.tag("v1.2.3")
-    
-    version_info = cmake_project.configure()
-    
-    # Verify basic version information
-    assert version_info.get("PROJECT_VERSION") == "1.2.3", "Wrong project version"
-    assert version_info.get("PROJECT_FULL_VERSION") == "1.2.3", "Wrong full version"
-    assert version_info.get("MAJOR_MACRO") == "1", "Wrong major version"
-    assert version_info.get("MINOR_MACRO") == "2", "Wrong minor version"
-    assert version_info.get("PATCH_MACRO") == "3", "Wrong patch version"
-    
-    # Verify extended information
-    assert version_info.get("PROJECT_IS_DIRTY") == False, "Should not be dirty"
-    assert version_info.get("PROJECT_IS_TAGGED") == True, "Should be tagged"
-    assert version_info.get("PROJECT_IS_DEVELOPMENT") == False, "Should not be development"
-    assert version_info.get("PROJECT_TAG_NAME") == "v1.2.3", "Wrong tag name"
 
-@pytest.mark.advanced
-def test_dirty_tagged_version(git_env, cmake_project):
-    """Test version extraction from a dirty tagged commit."""
-    # Create initial commit
+    return {
+        "version": "1.2.3",
+        "full": ("equals", "1.2.3"),
+        "components": ("1", "2", "3"),
+        "is_dirty": False,
+        "is_tagged": True,
+        "is_development": False,
+        "tag_name": "v1.2.3",
+    }
+
+
+def _dirty_tagged(git_env, cmake_project):
     git_env.create_file("README.md", "# Test Project")
     git_env.commit("Initial commit")
-    
+
     # Create a tag
     git_env.tag("v2.1.0")
-    
+
     # Modify a file without committing (make it dirty)
     git_env.modify_file("README.md", "\n# Modified content")
-    
-    # Verify repository is dirty
     assert git_env.is_dirty() == True, "Repository should be dirty"
-    
-    # Create CMake project with extended parameters
+
     cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
-    version_info = cmake_project.configure()
-    
-    # Verify basic version information
-    assert version_info.get("PROJECT_VERSION") == "2.1.0", "Wrong project version"
-    assert version_info.get("PROJECT_FULL_VERSION") == "2.1.0-dirty", "Full version should include -dirty"
-    assert version_info.get("MAJOR_MACRO") == "2", "Wrong major version"
-    assert version_info.get("MINOR_MACRO") == "1", "Wrong minor version"
-    assert version_info.get("PATCH_MACRO") == "0", "Wrong patch version"
-    
-    # Verify extended information
-    assert version_info.get("PROJECT_IS_DIRTY") == True, "Should be dirty"
-    assert version_info.get("PROJECT_IS_TAGGED") == True, "Should be tagged"
-    assert version_info.get("PROJECT_IS_DEVELOPMENT") == False, "Should not be development"
 
-@pytest.mark.advanced
-def test_clean_development_version(git_env, cmake_project):
-    """Test version extraction from a clean development commit."""
-    # Create initial commit and tag
+    return {
+        "version": "2.1.0",
+        "full": ("equals", "2.1.0-dirty"),
+        "components": ("2", "1", "0"),
+        "is_dirty": True,
+        "is_tagged": True,
+        "is_development": False,
+    }
+
+
+def _clean_development(git_env, cmake_project):
     git_env.create_file("README.md", "# Test Project")
     git_env.commit("Initial commit")
     git_env.tag("v1.5.2")
-    
+
     # Add another commit (development version)
     git_env.create_file("feature.txt", "New feature")
     git_env.commit("Add new feature")
-    
-    # Create CMake project with extended parameters and commit to keep repo clean
+
+    # Commit the CMake project files to keep the repo clean
     cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
     cmake_project.commit_project_files(git_env)
-    version_info = cmake_project.configure()
-    
-    # Verify basic version information
-    assert version_info.get("PROJECT_VERSION") == "1.5.2", "Wrong project version"
-    
-    # Full version should be development format (2 commits after tag: feature + cmake files)
-    full_version = version_info.get("PROJECT_FULL_VERSION")
-    assert full_version.startswith("1.5.2-dev.2+"), f"Expected development version, got: {full_version}"
-    assert "-dirty" not in full_version, f"Clean version should not have -dirty: {full_version}"
-    
-    # Verify extended information
-    assert version_info.get("PROJECT_IS_DIRTY") == False, "Should not be dirty"
-    assert version_info.get("PROJECT_IS_TAGGED") == False, "Should not be tagged"
-    assert version_info.get("PROJECT_IS_DEVELOPMENT") == True, "Should be development"
 
-@pytest.mark.advanced
-def test_dirty_development_version(git_env, cmake_project):
-    """Test version extraction from a dirty development commit."""
-    # Create initial commit and tag
+    return {
+        "version": "1.5.2",
+        # 2 commits after tag: feature + cmake files
+        "full": ("startswith", "1.5.2-dev.2+"),
+        "full_excludes": "-dirty",
+        "is_dirty": False,
+        "is_tagged": False,
+        "is_development": True,
+    }
+
+
+def _dirty_development(git_env, cmake_project):
     git_env.create_file("README.md", "# Test Project")
     git_env.commit("Initial commit")
     git_env.tag("v3.0.1")
-    
+
     # Add another commit (development version)
     git_env.create_file("feature.txt", "New feature")
     git_env.commit("Add new feature")
-    
+
     # Modify a file without committing (make it dirty)
     git_env.modify_file("feature.txt", "\n# Work in progress")
-    
-    # Verify repository is dirty
     assert git_env.is_dirty() == True, "Repository should be dirty"
-    
-    # Create CMake project with extended parameters
+
+    cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
+
+    return {
+        "version": "3.0.1",
+        "full": ("startswith", "3.0.1-dev.1+"),
+        "full_suffix": ".dirty",
+        "is_dirty": True,
+        "is_tagged": False,
+        "is_development": True,
+    }
+
+
+def _no_tags_dirty(git_env, cmake_project):
+    git_env.create_file("README.md", "# Test Project")
+    git_env.commit("Initial commit")
+
+    # Modify file to make it dirty
+    git_env.modify_file("README.md", "\n# Modified")
+    assert git_env.is_dirty() == True, "Repository should be dirty"
+
     cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
+
+    return {
+        "version": "0.0.0",
+        "full": ("startswith", "0.0.0+"),
+        "full_suffix": ".dirty",
+        "is_dirty": True,
+        "is_tagged": False,
+        "is_development": False,  # No tags, so not development
+    }
+
+
+_SCENARIOS = {
+    "clean_tagged": _clean_tagged,
+    "dirty_tagged": _dirty_tagged,
+    "clean_development": _clean_development,
+    "dirty_development": _dirty_development,
+    "no_tags_dirty": _no_tags_dirty,
+}
+
+
+# Use pytest marker to mark this as an advanced test
+@pytest.mark.advanced
+@pytest.mark.parametrize("scenario", list(_SCENARIOS))
+def test_version_scenarios(git_env, cmake_project, scenario):
+    """Test version extraction across clean/dirty tagged and development states."""
+    expected = _SCENARIOS[scenario](git_env, cmake_project)
     version_info = cmake_project.configure()
-    
+
     # Verify basic version information
-    assert version_info.get("PROJECT_VERSION") == "3.0.1", "Wrong project version"
-    
-    # Full version should be dirty development format
+    assert version_info.get("PROJECT_VERSION") == expected["version"], "Wrong project version"
+
     full_version = version_info.get("PROJECT_FULL_VERSION")
-    assert full_version.startswith("3.0.1-dev.1+"), f"Expected development version, got: {full_version}"
-    assert full_version.endswith(".dirty"), f"Dirty development version should end with .dirty: {full_version}"
-    
+    kind, value = expected["full"]
+    if kind == "equals":
+        assert full_version == value, f"Wrong full version: {full_version}"
+    else:
+        assert full_version.startswith(value), f"Unexpected full version: {full_version}"
+    if "full_suffix" in expected:
+        assert full_version.endswith(expected["full_suffix"]), \
+            f"Expected version to end with {expected['full_suffix']}: {full_version}"
+    if "full_excludes" in expected:
+        assert expected["full_excludes"] not in full_version, \
+            f"Unexpected {expected['full_excludes']} in version: {full_version}"
+
+    if "components" in expected:
+        major, minor, patch = expected["components"]
+        assert version_info.get("MAJOR_MACRO") == major, "Wrong major version"
+        assert version_info.get("MINOR_MACRO") == minor, "Wrong minor version"
+        assert version_info.get("PATCH_MACRO") == patch, "Wrong patch version"
+
     # Verify extended information
-    assert version_info.get("PROJECT_IS_DIRTY") == True, "Should be dirty"
-    assert version_info.get("PROJECT_IS_TAGGED") == False, "Should not be tagged"
-    assert version_info.get("PROJECT_IS_DEVELOPMENT") == True, "Should be development"
+    assert version_info.get("PROJECT_IS_DIRTY") == expected["is_dirty"], "Wrong dirty state"
+    assert version_info.get("PROJECT_IS_TAGGED") == expected["is_tagged"], "Wrong tagged state"
+    assert version_info.get("PROJECT_IS_DEVELOPMENT") == expected["is_development"], "Wrong development state"
+    if "tag_name" in expected:
+        assert version_info.get("PROJECT_TAG_NAME") == expected["tag_name"], "Wrong tag name"
+
 
 @pytest.mark.advanced
-def test_no_tags_dirty_version(git_env, cmake_project):
-    """Test version extraction from a repository with no tags but dirty state."""
-    # Create initial commit but no tag
+def test_skip_dirty_check(git_env, cmake_project):
+    """Test that SKIP_DIRTY_CHECK reports a dirty worktree as clean."""
     git_env.create_file("README.md", "# Test Project")
     git_env.commit("Initial commit")
-    
-    # Modify file to make it dirty
-    git_env.modify_file("README.md", "\n# Modified")
+    git_env.tag("v2.1.0")
+
+    # Modify a file without committing (make it dirty)
+    git_env.modify_file("README.md", "\n# Modified content")
     assert git_env.is_dirty() == True, "Repository should be dirty"
-    
-    # Create CMake project with extended parameters
-    cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True})
+
+    cmake_project.create_cmakelists({"INCLUDE_EXTENDED": True, "SKIP_DIRTY_CHECK": True})
     version_info = cmake_project.configure()
-    
-    # Should use default version with commit hash and dirty suffix
-    assert version_info.get("PROJECT_VERSION") == "0.0.0", "Wrong project version"
-    
+
+    # The worktree is dirty, but the check was skipped entirely
+    assert version_info.get("PROJECT_IS_DIRTY") == False, "IS_DIRTY should be FALSE with SKIP_DIRTY_CHECK"
     full_version = version_info.get("PROJECT_FULL_VERSION")
-    assert full_version.startswith("0.0.0+"), f"Expected version with commit hash, got: {full_version}"
-    assert full_version.endswith(".dirty"), f"Dirty version should end with .dirty: {full_version}"
-    
-    # Verify extended information
-    assert version_info.get("PROJECT_IS_DIRTY") == True, "Should be dirty"
-    assert version_info.get("PROJECT_IS_TAGGED") == False, "Should not be tagged"
-    assert version_info.get("PROJECT_IS_DEVELOPMENT") == False, "Should not be development (no tags)"
+    assert full_version == "2.1.0", f"Expected full version without dirty suffix: {full_version}"
@@ -6,30 +6,19 @@ Tests for GitVersion.cmake with multiple version tags.
 """
 
 import pytest
-import os
 
 @pytest.mark.advanced
 def test_multiple_version_tags(git_env, cmake_project, gitversion_cmake_path):
     """Test version extraction when multiple version tags are present."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.0.0")  # First tag
-    
-    # Create src directory explicitly
-    os.makedirs(git_env.root_dir / "src", exist_ok=True)
-    
-    # Add more commits and tags
-    git_env.create_file("src/main.cpp", "int main() { return 0; }")
-    git_env.commit("Add main.cpp")
-    git_env.tag("1.1.0")  # Second tag
-    
-    git_env.create_file("CMakeLists.txt", "cmake_minimum_required(VERSION 3.12)")
-    git_env.commit("Add CMakeLists.txt")
-    git_env.tag("1.2.0")  # Third tag
-    
-    # Create a CMake project and configure
-    cmake_project.create_cmakelists()
+    # Build the tagged history in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "1.0.0"),
+        ({"src/main.cpp": "int main() { return 0; }"}, "Add main.cpp", "1.1.0"),
+        ({"CMakeLists.txt": "cmake_minimum_required(VERSION 3.12)"}, "Add CMakeLists.txt", "1.2.0"),
+    ])
+
+    # Create a CMake project and configure; dirty state is irrelevant here
+    cmake_project.create_cmakelists({"SKIP_DIRTY_CHECK": True})
     version_info = cmake_project.configure()
     
     # Verify some version information is present (specific version may vary)
@@ -42,25 +31,15 @@ def test_multiple_version_tags(git_env, cmake_project, gitversion_cmake_path):
 @pytest.mark.advanced
 def test_latest_tag_with_prefix(git_env, cmake_project, gitversion_cmake_path):
     """Test version extraction when multiple tagged versions with prefixes are present."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("v1.0.0")  # First tag
-    
-    # Create src directory explicitly
-    os.makedirs(git_env.root_dir / "src", exist_ok=True)
-    
-    # Add more commits and tags
-    git_env.create_file("src/main.cpp", "int main() { return 0; }")
-    git_env.commit("Add main.cpp")
-    git_env.tag("v1.1.0")  # Second tag
-    
-    git_env.create_file("CMakeLists.txt", "cmake_minimum_required(VERSION 3.12)")
-    git_env.commit("Add CMakeLists.txt")
-    git_env.tag("v2.0.0")  # Third tag with major version bump
-    
-    # Create a CMake project with the "v" prefix
-    cmake_project.create_cmakelists()
+    # Build the tagged history in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "v1.0.0"),
+        ({"src/main.cpp": "int main() { return 0; }"}, "Add main.cpp", "v1.1.0"),
+        ({"CMakeLists.txt": "cmake_minimum_required(VERSION 3.12)"}, "Add CMakeLists.txt", "v2.0.0"),
+    ])
+
+    # Create a CMake project with the "v" prefix; dirty state is irrelevant here
+    cmake_project.create_cmakelists({"SKIP_DIRTY_CHECK": True})
     version_info = cmake_project.configure()
     
     # Verify version information is present
@@ -87,14 +66,13 @@ def test_mixed_tag_formats(git_env, cmake_project, gitversion_cmake_path):
     git_env.commit("Add file1")
     git_env.tag("2.0.0")  # Tag without prefix
 
-    cmake_project.create_cmakelists()
+    # CMakeLists.txt is unchanged; just reconfigure
     version_info = cmake_project.configure()
     assert version_info.get("PROJECT_VERSION") == "2.0.0", f"Wrong project version: {version_info.get('PROJECT_VERSION')}"
     
     git_env.create_file("file2.txt", "content")
     git_env.commit("Add file2")
     git_env.tag("v3.0.0")  # Tag with different prefix
-    
-    cmake_project.create_cmakelists()
+
     version_info = cmake_project.configure()
     assert version_info.get("PROJECT_VERSION") == "3.0.0", f"Wrong project version: {version_info.get('PROJECT_VERSION')}"
@@ -22,19 +22,42 @@ def gitversion_cmake_path(project_root):
     """Return the path to the GitVersion.cmake file."""
     return project_root / "cmake/GitVersion.cmake"
 
+# Session-scoped template repository cloned by each git_env instance
+@pytest.fixture(scope="session")
+def baseline_repo(tmp_path_factory):
+    """Create a pre-initialized Git repository used as a per-test template.
+
+    The template already contains a baseline commit, so per-test clones
+    skip the init/config/commit subprocess chain. The baseline README
+    content is deliberately different from anything the tests write, so
+    their own commits are never empty.
+    """
+    from tests.utils.git_environment import GitEnvironment
+    template_dir = tmp_path_factory.mktemp("baseline_repo")
+    template = GitEnvironment(str(template_dir))
+    template.create_file("README.md", "# Baseline")
+    template.commit("Baseline commit")
+    return template_dir
+
 # Import git_environment fixture for creating temporary Git repos
 @pytest.fixture
-def git_env():
+def git_env(baseline_repo):
     """Create a temporary Git environment for testing."""
     from tests.utils.git_environment import GitEnvironment
-    env = GitEnvironment()
+    env = GitEnvironment(template=baseline_repo)
     yield env
     # Cleanup happens automatically in GitEnvironment's __del__ method
 
+# Delete trashed test repositories while worker threads are still available
+def pytest_sessionfinish(session, exitstatus):
+    """Flush deferred repository cleanup at the end of the session."""
+    from tests.utils.git_environment import cleanup_trash
+    cleanup_trash()
+
 # Import cmake_project fixture for creating temporary CMake projects
 @pytest.fixture
 def cmake_project(git_env, gitversion_cmake_path):
     """Create a temporary CMake project for testing."""
     from tests.utils.cmake_project import CMakeProject
-    project = CMakeProject(git_env.root_dir, gitversion_cmake_path)
+    project = CMakeProject(git_env.root_dir, gitversion_cmake_path, git_env=git_env)
     return project 
\ No newline at end of file
@@ -9,14 +9,19 @@ import pytest
 import subprocess
 import re
 
+# Error-message fragments asserted on repeatedly; defined once at module scope
+_CMAKE_ERROR = "CMake Error"
+_MISMATCH_MSG = "does not match Git tag"
+_ORDERING_MSG = "must be >= tagged ancestor"
+
 @pytest.mark.edge_cases
 def test_fail_on_mismatch_exact_match(git_env, cmake_project, gitversion_cmake_path):
     """Test FAIL_ON_MISMATCH option with an exact tag match."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.2.3")  # Exact version tag
-    
+    # Build the repository state in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "1.2.3"),
+    ])
+
     # Create a CMake project with FAIL_ON_MISMATCH and same DEFAULT_VERSION
     cmake_project.create_cmakelists({
         "DEFAULT_VERSION": "1.2.3",
@@ -33,39 +38,14 @@ def test_fail_on_mismatch_exact_match(git_env, cmake_project, gitversion_cmake_p
     assert version_info.get("PATCH_MACRO") == "3", "Wrong patch version"
 
 
-@pytest.mark.edge_cases
-def test_fail_on_mismatch_version_mismatch(git_env, cmake_project, gitversion_cmake_path):
-    """Test FAIL_ON_MISMATCH option with a version mismatch."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.2.3")  # Exact version tag
-    
-    # Create a CMake project with FAIL_ON_MISMATCH and different DEFAULT_VERSION
-    cmake_project.create_cmakelists({
-        "DEFAULT_VERSION": "2.0.0",  # Different from the actual tag
-        "FAIL_ON_MISMATCH": True
-    })
-    
-    # Should fail because DEFAULT_VERSION doesn't match the tag version
-    with pytest.raises(subprocess.CalledProcessError) as excinfo:
-        cmake_project.configure()
-    
-    # Check for the specific error message about version mismatch
-    error_output = excinfo.value.stderr
-    assert "CMake Error" in error_output, f"Missing CMake Error in output: {error_output}"
-    assert "does not match Git tag" in error_output, f"Missing specific error message about version mismatch: {error_output}"
-    assert "2.0.0" in error_output and "1.2.3" in error_output, f"Missing version numbers in error message: {error_output}"
-
-
 @pytest.mark.edge_cases
 def test_fail_on_mismatch_with_prefix(git_env, cmake_project, gitversion_cmake_path):
     """Test FAIL_ON_MISMATCH option with a tag prefix."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("v1.2.3")  # Tag with prefix
-    
+    # Build the repository state in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "v1.2.3"),
+    ])
+
     # Create a CMake project with FAIL_ON_MISMATCH, prefix, and matching DEFAULT_VERSION
     cmake_project.create_cmakelists({
         "DEFAULT_VERSION": "1.2.3",
@@ -82,43 +62,15 @@ def test_fail_on_mismatch_with_prefix(git_env, cmake_project, gitversion_cmake_p
     assert version_info.get("PATCH_MACRO") == "3", "Wrong patch version"
 
 
-@pytest.mark.edge_cases
-def test_fail_on_mismatch_with_prefix_mismatch(git_env, cmake_project, gitversion_cmake_path):
-    """Test FAIL_ON_MISMATCH option with a tag prefix but mismatched version."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("v1.2.3")  # Tag with prefix
-    
-    # Create a CMake project with mismatched version
-    cmake_project.create_cmakelists({
-        "DEFAULT_VERSION": "2.0.0",  # Different from tag version
-        "FAIL_ON_MISMATCH": True
-    })
-    
-    # Should fail because of version mismatch
-    with pytest.raises(subprocess.CalledProcessError) as excinfo:
-        cmake_project.configure()
-    
-    # Check for the specific error message
-    error_output = excinfo.value.stderr
-    assert "CMake Error" in error_output, f"Missing CMake Error in output: {error_output}"
-    assert "does not match Git tag" in error_output, f"Missing specific error message about version mismatch: {error_output}"
-    assert "2.0.0" in error_output and "1.2.3" in error_output, f"Missing version numbers in error message: {error_output}"
-
-
 @pytest.mark.edge_cases
 def test_fail_on_mismatch_with_development_version(git_env, cmake_project, gitversion_cmake_path):
     """Test FAIL_ON_MISMATCH option with a development version (commits after tag)."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.2.3")  # Tag
-    
-    # Add another commit to create a development version
-    git_env.create_file("file.txt", "content")
-    git_env.commit("Another commit")
-    
+    # Build the repository state in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "1.2.3"),
+        ({"file.txt": "content"}, "Another commit", None),
+    ])
+
     # Create a CMake project where DEFAULT_VERSION equals the tag version
     # This should fail because with FAIL_ON_MISMATCH, DEFAULT_VERSION should be equal to the tag version
     cmake_project.create_cmakelists({
@@ -132,22 +84,19 @@ def test_fail_on_mismatch_with_development_version(git_env, cmake_project, gitve
     
     # Check for the specific error message
     error_output = excinfo.value.stderr
-    assert "CMake Error" in error_output, f"Missing CMake Error in output: {error_output}"
-    assert "must be >= tagged ancestor" in error_output, f"Missing specific error about version needing to be equal: {error_output}"
+    assert _CMAKE_ERROR in error_output, f"Missing CMake Error in output: {error_output}"
+    assert _ORDERING_MSG in error_output, f"Missing specific error about version needing to be equal: {error_output}"
 
 
 @pytest.mark.edge_cases
 def test_fail_on_mismatch_with_development_version_success(git_env, cmake_project, gitversion_cmake_path):
     """Test FAIL_ON_MISMATCH with development version and correct higher DEFAULT_VERSION."""
-    # Create files and commits
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.2.3")  # Tag
-    
-    # Add another commit to create a development version
-    git_env.create_file("file.txt", "content")
-    git_env.commit("Another commit")
-    
+    # Build the repository state in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "1.2.3"),
+        ({"file.txt": "content"}, "Another commit", None),
+    ])
+
     # Create a CMake project with DEFAULT_VERSION equal to the tag version
     cmake_project.create_cmakelists({
         "DEFAULT_VERSION": "1.2.3",
@@ -194,15 +143,12 @@ def test_no_tag_with_fail_on_mismatch(git_env, cmake_project, gitversion_cmake_p
 @pytest.mark.edge_cases
 def test_mixed_prefix_tags(git_env, cmake_project, gitversion_cmake_path):
     """Test with mixed prefix tags (both with and without prefix)."""
-    # Create repo with two tags: one with prefix, one without
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.0.0")  # No prefix
-    
-    git_env.create_file("file.txt", "content")
-    git_env.commit("Second commit")
-    git_env.tag("v2.0.0")  # With prefix
-    
+    # Build two tagged commits (one prefixed, one not) in a single stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", "1.0.0"),
+        ({"file.txt": "content"}, "Second commit", "v2.0.0"),
+    ])
+
     # Test with prefix matching
     cmake_project.create_cmakelists({
         "DEFAULT_VERSION": "2.0.0",
@@ -215,26 +161,37 @@ def test_mixed_prefix_tags(git_env, cmake_project, gitversion_cmake_path):
 
 
 @pytest.mark.edge_cases
-def test_error_message_format(git_env, cmake_project, gitversion_cmake_path):
-    """Test that the error message is properly formatted and contains key information."""
-    git_env.create_file("README.md", "# Test Project")
-    git_env.commit("Initial commit")
-    git_env.tag("1.2.3")
-    
-    # Create a CMake project with mismatched version
+@pytest.mark.parametrize("tag,default_version,patterns", [
+    # Plain tag, mismatching default version
+    ("1.2.3", "2.0.0", [_CMAKE_ERROR, _MISMATCH_MSG, r"2\.0\.0", r"1\.2\.3"]),
+    # Prefixed tag, mismatching default version
+    ("v1.2.3", "2.0.0", [_CMAKE_ERROR, _MISMATCH_MSG, r"2\.0\.0", r"1\.2\.3"]),
+    # Structured check of the whole message format. Lazy [\s\S]*? spans
+    # anchored on literal fragments replace greedy .* with DOTALL, which
+    # backtracks badly on long stderr output.
+    ("1.2.3", "9.9.9",
+     [r"CMake Error at[^\n]*GitVersion\.cmake[\s\S]*?message[\s\S]*?"
+      r"Project version \(9\.9\.9\)[\s\S]*?does not match Git tag \(1\.2\.3\)"]),
+])
+def test_fail_on_mismatch_rejects(git_env, cmake_project, tag, default_version, patterns):
+    """Test that FAIL_ON_MISMATCH rejects a DEFAULT_VERSION differing from the tag."""
+    # Build the repository state in a single fast-import stream
+    git_env.build_history([
+        ({"README.md": "# Test Project"}, "Initial commit", tag),
+    ])
+
+    # Create a CMake project with a mismatched version
     cmake_project.create_cmakelists({
-        "DEFAULT_VERSION": "9.9.9",  # Very different from tag
+        "DEFAULT_VERSION": default_version,
         "FAIL_ON_MISMATCH": True
     })
-    
-    # Should fail with specific error message
+
+    # Should fail because DEFAULT_VERSION doesn't match the tag version
     with pytest.raises(subprocess.CalledProcessError) as excinfo:
         cmake_project.configure()
-    
+
+    # Check the error message content against each expected pattern
     error_output = excinfo.value.stderr
-    
-    # Define regex pattern for expected error message
-    error_pattern = r"CMake Error at.*GitVersion\.cmake.*message.*Project version \(9\.9\.9\).*does not match Git tag \(1\.2\.3\)"
-    
-    # Check with regex for a more structured error message validation
-    assert re.search(error_pattern, error_output, re.DOTALL), f"Error message doesn't match expected format: {error_output}" 
+    for pattern in patterns:
+        assert re.search(pattern, error_output), \
+            f"Error message doesn't match {pattern!r}: {error_output}"
@@ -12,23 +12,152 @@ import subprocess
 from pathlib import Path
 from typing import Dict, Optional
 
+# cmake binary resolved once at import so each configure skips the PATH
+# walk; fall back to the bare name if it is not on PATH yet
+_CMAKE_BIN = shutil.which("cmake") or "cmake"
+
+# Generator passed to every configure so CMake skips auto-detection;
+# the PATH walk for ninja happens once per process
+_CMAKE_GENERATOR = "Ninja" if shutil.which("ninja") else "Unix Makefiles"
+
+# Template for the generated CMakeLists.txt, formatted with {params}.
+# string.Template is unsuitable here: its $ delimiter collides with
+# CMake's own ${VAR} syntax, so str.format with doubled braces is used.
+_CMAKELISTS_TEMPLATE = """
+cmake_minimum_required(VERSION 3.12)
+
+# Include GitVersion.cmake
+include(${{CMAKE_CURRENT_SOURCE_DIR}}/cmake/GitVersion.cmake)
+
+# Extract version information
+git_version_info(
+  {params}
+)
+
+# Create a project with the version (VERSION is always clean semantic version).
+# No languages: the tests only read version variables, so skipping compiler
+# detection removes the largest configure cost.
+project(TestProject VERSION "${{PROJECT_VERSION}}" LANGUAGES NONE)
+
+# Output version information to a file
+configure_file(
+  "${{CMAKE_CURRENT_SOURCE_DIR}}/version.h.in"
+  "${{CMAKE_CURRENT_BINARY_DIR}}/version.h"
+)
+"""
+
+# version.h.in template covering the extended output set
+_VERSION_H_IN_EXTENDED = """
+#pragma once
+
+#define PROJECT_VERSION "${PROJECT_VERSION}"
+#define PROJECT_FULL_VERSION "${PROJECT_FULL_VERSION}"
+#define PROJECT_VERSION_MAJOR ${PROJECT_VERSION_MAJOR}
+#define PROJECT_VERSION_MINOR ${PROJECT_VERSION_MINOR}
+#define PROJECT_VERSION_PATCH ${PROJECT_VERSION_PATCH}
+#define PROJECT_COMMIT_HASH "${PROJECT_COMMIT_HASH}"
+#define PROJECT_COMMIT_COUNT ${PROJECT_COMMIT_COUNT}
+#cmakedefine01 PROJECT_IS_DIRTY
+#cmakedefine01 PROJECT_IS_TAGGED
+#cmakedefine01 PROJECT_IS_DEVELOPMENT
+#define PROJECT_TAG_NAME "${PROJECT_TAG_NAME}"
+#define PROJECT_BRANCH_NAME "${PROJECT_BRANCH_NAME}"
+"""
+
+# version.h.in template covering only the basic version fields
+_VERSION_H_IN_BASIC = """
+#pragma once
+
+#define PROJECT_VERSION "${PROJECT_VERSION}"
+#define PROJECT_FULL_VERSION "${PROJECT_FULL_VERSION}"
+#define PROJECT_VERSION_MAJOR ${PROJECT_VERSION_MAJOR}
+#define PROJECT_VERSION_MINOR ${PROJECT_VERSION_MINOR}
+#define PROJECT_VERSION_PATCH ${PROJECT_VERSION_PATCH}
+"""
+
+# git_version_info() arguments emitted for every generated CMakeLists.txt
+_BASIC_PARAMS = (
+    "VERSION PROJECT_VERSION",
+    "FULL_VERSION PROJECT_FULL_VERSION",
+    "MAJOR PROJECT_VERSION_MAJOR",
+    "MINOR PROJECT_VERSION_MINOR",
+    "PATCH PROJECT_VERSION_PATCH",
+)
+
+# Additional arguments emitted when INCLUDE_EXTENDED is requested
+_EXTENDED_PARAMS = (
+    "COMMIT_HASH PROJECT_COMMIT_HASH",
+    "COMMIT_COUNT PROJECT_COMMIT_COUNT",
+    "IS_DIRTY PROJECT_IS_DIRTY",
+    "IS_TAGGED PROJECT_IS_TAGGED",
+    "IS_DEVELOPMENT PROJECT_IS_DEVELOPMENT",
+    "TAG_NAME PROJECT_TAG_NAME",
+    "BRANCH_NAME PROJECT_BRANCH_NAME",
+)
+
+# Single pattern matching every #define in version.h; quotes are optional
+# so numeric and flag values match too, and the non-empty group skips
+# empty strings ("") the same way the previous per-field patterns did.
+# A bytes pattern: the file is pure ASCII, so matching the raw bytes
+# skips the up-front decode and only the captured values are decoded.
+_VERSION_H_DEFINE_RE = re.compile(rb'^#define (\w+) "?([^"\n]+?)"?$', re.M)
+
+# Maps the macro name in version.h to (output key, 0/1-flag?)
+_VERSION_H_FIELDS = {
+    b"PROJECT_VERSION": ("PROJECT_VERSION", False),
+    b"PROJECT_FULL_VERSION": ("PROJECT_FULL_VERSION", False),
+    b"PROJECT_VERSION_MAJOR": ("MAJOR_MACRO", False),
+    b"PROJECT_VERSION_MINOR": ("MINOR_MACRO", False),
+    b"PROJECT_VERSION_PATCH": ("PATCH_MACRO", False),
+    b"PROJECT_COMMIT_HASH": ("PROJECT_COMMIT_HASH", False),
+    b"PROJECT_COMMIT_COUNT": ("PROJECT_COMMIT_COUNT", False),
+    b"PROJECT_IS_DIRTY": ("PROJECT_IS_DIRTY", True),
+    b"PROJECT_IS_TAGGED": ("PROJECT_IS_TAGGED", True),
+    b"PROJECT_IS_DEVELOPMENT": ("PROJECT_IS_DEVELOPMENT", True),
+    b"PROJECT_TAG_NAME": ("PROJECT_TAG_NAME", False),
+    b"PROJECT_BRANCH_NAME": ("PROJECT_BRANCH_NAME", False),
+}
+
 
 class CMakeProject:
     """Class to manage a CMake project for testing."""
     
-    def __init__(self, root_dir: Path, gitversion_path: Path):
+    def __init__(self, root_dir: Path, gitversion_path: Path, git_env=None):
         """Initialize a CMake project.
-        
+
         Args:
             root_dir: The project root directory
             gitversion_path: Path to GitVersion.cmake
+            git_env: Optional GitEnvironment owning root_dir, notified when
+                project files are written so its caches stay coherent
         """
         self.root_dir = root_dir
-        
-        # Copy GitVersion.cmake to the project
+        self.git_env = git_env
+
+        # The build directory is created once and reused by every
+        # configure() call, so CMake's own caches stay warm within a test
+        self.build_dir = root_dir / "build"
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+
+        # Content of the last create_cmakelists() render, used to skip
+        # rewriting identical project files (and the mtime bump that would
+        # invalidate CMake's configure cache)
+        self._last_render = None
+
+        # Link GitVersion.cmake into the project: include() only reads the
+        # file, so a symlink (or hardlink) avoids copying it per test.
+        # Fall back to a plain copy where links are unavailable.
         cmake_dir = root_dir / "cmake"
-        os.makedirs(cmake_dir, exist_ok=True)
-        shutil.copy(gitversion_path, cmake_dir / "GitVersion.cmake")
+        cmake_dir.mkdir(parents=True, exist_ok=True)
+        source = gitversion_path.resolve()
+        target = cmake_dir / "GitVersion.cmake"
+        try:
+            os.symlink(source, target)
+        except OSError:
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy(source, target)
     
     def create_cmakelists(self, config: Optional[Dict[str, str]] = None) -> None:
         """Create a CMakeLists.txt file.
@@ -39,29 +168,13 @@ class CMakeProject:
         if config is None:
             config = {}
             
-        # Build parameter list for git_version_info
-        params = []
-        
-        # Always include basic version parameters
-        params.extend([
-            "VERSION PROJECT_VERSION",
-            "FULL_VERSION PROJECT_FULL_VERSION",
-            "MAJOR PROJECT_VERSION_MAJOR",
-            "MINOR PROJECT_VERSION_MINOR",
-            "PATCH PROJECT_VERSION_PATCH"
-        ])
-        
+        # Build parameter list for git_version_info, starting from the
+        # constant basic set
+        params = list(_BASIC_PARAMS)
+
         # Add optional extended parameters
         if config.get("INCLUDE_EXTENDED", False):
-            params.extend([
-                "COMMIT_HASH PROJECT_COMMIT_HASH",
-                "COMMIT_COUNT PROJECT_COMMIT_COUNT",
-                "IS_DIRTY PROJECT_IS_DIRTY",
-                "IS_TAGGED PROJECT_IS_TAGGED",
-                "IS_DEVELOPMENT PROJECT_IS_DEVELOPMENT",
-                "TAG_NAME PROJECT_TAG_NAME",
-                "BRANCH_NAME PROJECT_BRANCH_NAME"
-            ])
+            params.extend(_EXTENDED_PARAMS)
         
         # Add source_dir if specified
         if "SOURCE_DIR" in config:
@@ -70,6 +183,10 @@ class CMakeProject:
         # Add FAIL_ON_MISMATCH if specified
         if config.get("FAIL_ON_MISMATCH", False):
             params.append("FAIL_ON_MISMATCH")
+
+        # Add SKIP_DIRTY_CHECK if specified
+        if config.get("SKIP_DIRTY_CHECK", False):
+            params.append("SKIP_DIRTY_CHECK")
             
         # Add DEFAULT_VERSION if specified
         if "DEFAULT_VERSION" in config:
@@ -79,83 +196,36 @@ class CMakeProject:
         if "HASH_LENGTH" in config:
             params.append(f'HASH_LENGTH {config["HASH_LENGTH"]}')
         
-        # Create parameter string
-        params_str = '\n  '.join(params)
-        
-        # Create CMakeLists.txt content
-        content = f"""
-cmake_minimum_required(VERSION 3.12)
+        # Render the CMakeLists.txt content from the module-level template
+        content = _CMAKELISTS_TEMPLATE.format(params='\n  '.join(params))
 
-# Include GitVersion.cmake
-include(${{CMAKE_CURRENT_SOURCE_DIR}}/cmake/GitVersion.cmake)
+        # Pick the version.h.in template (extended if requested)
+        if config.get("INCLUDE_EXTENDED", False):
+            version_template = _VERSION_H_IN_EXTENDED
+        else:
+            version_template = _VERSION_H_IN_BASIC
 
-# Extract version information
-git_version_info(
-  {params_str}
-)
 
-# Create a project with the version (VERSION is always clean semantic version)
-project(TestProject VERSION "${{PROJECT_VERSION}}")
+        # Skip the writes entirely when nothing changed since the last
+        # render; repeated create_cmakelists() calls within a test are common
+        render = (content, version_template)
+        if render == self._last_render:
+            return
+        self._last_render = render
 
-# Output version information to a file
-configure_file(
-  "${{CMAKE_CURRENT_SOURCE_DIR}}/version.h.in"
-  "${{CMAKE_CURRENT_BINARY_DIR}}/version.h"
-)
+        # Write files as pre-encoded bytes (one call each, LF endings on
+        # every platform)
+        (self.root_dir / "CMakeLists.txt").write_bytes(content.encode("utf-8"))
 
-# Create a simple executable
-add_executable(test_app main.cpp)
-"""
-        
-        # Create version.h.in template (extended if requested)
-        if config.get("INCLUDE_EXTENDED", False):
-            version_template = """
-#pragma once
+        # Keep the build directory out of git status so generated build
+        # files don't make the repository look dirty
+        (self.root_dir / ".gitignore").write_bytes(b"build/\n")
 
-#define PROJECT_VERSION "${PROJECT_VERSION}"
-#define PROJECT_FULL_VERSION "${PROJECT_FULL_VERSION}"
-#define PROJECT_VERSION_MAJOR ${PROJECT_VERSION_MAJOR}
-#define PROJECT_VERSION_MINOR ${PROJECT_VERSION_MINOR}
-#define PROJECT_VERSION_PATCH ${PROJECT_VERSION_PATCH}
-#define PROJECT_COMMIT_HASH "${PROJECT_COMMIT_HASH}"
-#define PROJECT_COMMIT_COUNT ${PROJECT_COMMIT_COUNT}
-#cmakedefine01 PROJECT_IS_DIRTY
-#cmakedefine01 PROJECT_IS_TAGGED
-#cmakedefine01 PROJECT_IS_DEVELOPMENT
-#define PROJECT_TAG_NAME "${PROJECT_TAG_NAME}"
-#define PROJECT_BRANCH_NAME "${PROJECT_BRANCH_NAME}"
-"""
-        else:
-            version_template = """
-#pragma once
+        (self.root_dir / "version.h.in").write_bytes(version_template.encode("utf-8"))
 
-#define PROJECT_VERSION "${PROJECT_VERSION}"
-#define PROJECT_FULL_VERSION "${PROJECT_FULL_VERSION}"
-#define PROJECT_VERSION_MAJOR ${PROJECT_VERSION_MAJOR}
-#define PROJECT_VERSION_MINOR ${PROJECT_VERSION_MINOR}
-#define PROJECT_VERSION_PATCH ${PROJECT_VERSION_PATCH}
-"""
-        
-        # Create main.cpp
-        main_cpp = """
-#include <iostream>
-#include "version.h"
-
-int main() {
-    std::cout << "Version: " << PROJECT_VERSION << std::endl;
-    return 0;
-}
-"""
-        
-        # Write files
-        with open(self.root_dir / "CMakeLists.txt", "w", newline='\n') as f:
-            f.write(content)
-            
-        with open(self.root_dir / "version.h.in", "w", newline='\n') as f:
-            f.write(version_template)
-            
-        with open(self.root_dir / "main.cpp", "w", newline='\n') as f:
-            f.write(main_cpp)
+        # The writes above dirty the repository's worktree
+        if self.git_env is not None:
+            self.git_env.invalidate_caches()
     
     def commit_project_files(self, git_env) -> None:
         """Commit the project files to Git to avoid dirty state.
@@ -163,12 +233,14 @@ int main() {
         Args:
             git_env: The GitEnvironment instance to use for committing
         """
-        # Add and commit the project files to avoid dirty state
-        import subprocess
-        subprocess.run(["git", "add", "CMakeLists.txt", "version.h.in", "main.cpp", "cmake/"], 
-                      cwd=self.root_dir, check=True, capture_output=True)
-        subprocess.run(["git", "commit", "-m", "Add CMake project files"], 
-                      cwd=self.root_dir, check=True, capture_output=True)
+        # Stage and commit through the environment's helper. Two git calls
+        # are the floor here: commit -o/--only cannot pick up untracked
+        # files (version.h.in, cmake/) without a prior add.
+        git_env._run_git_command("add", "--", "CMakeLists.txt", "version.h.in",
+                                 "cmake/", ".gitignore", capture=False)
+        git_env._run_git_command("commit", "-m", "Add CMake project files",
+                                 capture=False)
+        git_env.invalidate_caches()
     
     def configure(self) -> Dict[str, str]:
         """Configure the CMake project.
@@ -179,80 +251,39 @@ int main() {
         Raises:
             subprocess.CalledProcessError: If CMake configuration fails
         """
-        # Create a build directory
-        build_dir = self.root_dir / "build"
-        os.makedirs(build_dir, exist_ok=True)
-        
-        # Run CMake
+        build_dir = self.build_dir
+
+        # Run CMake. Output is captured as bytes: the success path never
+        # looks at it, so decoding is deferred to the error handler.
         try:
-            result = subprocess.run(
-                ["cmake", ".."],
+            subprocess.run(
+                [_CMAKE_BIN, "-G", _CMAKE_GENERATOR, ".."],
                 cwd=build_dir,
                 check=True,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
-            
-            # Extract version information from the output file
-            version_file = build_dir / "version.h"
-            with open(version_file, "r") as f:
-                version_h = f.read()
-            
-            # Extract version strings using regex
-            version_match = re.search(r'#define PROJECT_VERSION "([^"]+)"', version_h)
-            full_version_match = re.search(r'#define PROJECT_FULL_VERSION "([^"]+)"', version_h)
-            major_match = re.search(r'#define PROJECT_VERSION_MAJOR (\d+)', version_h)
-            minor_match = re.search(r'#define PROJECT_VERSION_MINOR (\d+)', version_h)
-            patch_match = re.search(r'#define PROJECT_VERSION_PATCH (\d+)', version_h)
-            
-            # Extract extended parameters if present
-            commit_hash_match = re.search(r'#define PROJECT_COMMIT_HASH "([^"]+)"', version_h)
-            commit_count_match = re.search(r'#define PROJECT_COMMIT_COUNT (\d+)', version_h)
-            is_dirty_match = re.search(r'#define PROJECT_IS_DIRTY ([01])', version_h)
-            is_tagged_match = re.search(r'#define PROJECT_IS_TAGGED ([01])', version_h)
-            is_development_match = re.search(r'#define PROJECT_IS_DEVELOPMENT ([01])', version_h)
-            tag_name_match = re.search(r'#define PROJECT_TAG_NAME "([^"]+)"', version_h)
-            branch_name_match = re.search(r'#define PROJECT_BRANCH_NAME "([^"]+)"', version_h)
-            
-            # Return the extracted values
+
+            # Extract version information from the output file; read as
+            # bytes and decode only the captured values
+            version_h = (build_dir / "version.h").read_bytes()
+
+            # Extract version information in a single pass over the file;
+            # flag fields come back as booleans, everything else as strings
             version_info = {}
-            
-            if version_match:
-                version_info["PROJECT_VERSION"] = version_match.group(1)
-            if full_version_match:
-                version_info["PROJECT_FULL_VERSION"] = full_version_match.group(1)
-            if major_match:
-                version_info["MAJOR_MACRO"] = major_match.group(1)
-            if minor_match:
-                version_info["MINOR_MACRO"] = minor_match.group(1)
-            if patch_match:
-                version_info["PATCH_MACRO"] = patch_match.group(1)
-            
-            # Add extended information if available
-            if commit_hash_match:
-                version_info["PROJECT_COMMIT_HASH"] = commit_hash_match.group(1)
-            if commit_count_match:
-                version_info["PROJECT_COMMIT_COUNT"] = commit_count_match.group(1)
-            if is_dirty_match:
-                version_info["PROJECT_IS_DIRTY"] = is_dirty_match.group(1) == "1"
-            if is_tagged_match:
-                version_info["PROJECT_IS_TAGGED"] = is_tagged_match.group(1) == "1"
-            if is_development_match:
-                version_info["PROJECT_IS_DEVELOPMENT"] = is_development_match.group(1) == "1"
-            if tag_name_match:
-                version_info["PROJECT_TAG_NAME"] = tag_name_match.group(1)
-            if branch_name_match:
-                version_info["PROJECT_BRANCH_NAME"] = branch_name_match.group(1)
-            
+            for match in _VERSION_H_DEFINE_RE.finditer(version_h):
+                field = _VERSION_H_FIELDS.get(match.group(1))
+                if field:
+                    key, is_flag = field
+                    value = match.group(2)
+                    version_info[key] = value == b"1" if is_flag else value.decode("utf-8")
+
             return version_info
         except subprocess.CalledProcessError as e:
-            # Enhance exception with details from stderr and stdout
+            # Decode the captured output now that someone will read it;
+            # errors="replace" avoids codec failures on odd platform output
+            e.stderr = e.stderr.decode("utf-8", "replace") if e.stderr else "No error output"
+            e.stdout = e.stdout.decode("utf-8", "replace") if e.stdout else "No standard output"
             print(f"CMake Error Output:\n{e.stderr}")
-            
-            # Make sure the exception contains the error information for the test to access
-            # This modifies the exception object to ensure stderr information is preserved
-            e.stderr = e.stderr if e.stderr else "No error output"
-            e.stdout = e.stdout if e.stdout else "No standard output"
-            
+
             # Raise the exception for the test to catch
-            raise 
+            raise
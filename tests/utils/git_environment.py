@@ -6,68 +6,250 @@ Git environment utilities for testing GitVersion.cmake.
 """
 
 import os
+import atexit
+import shutil
 import tempfile
 import subprocess
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+def _tmp_base() -> Optional[str]:
+    """Pick the base directory for temporary repositories.
+
+    GITVERSION_TEST_TMPDIR, when set, names the directory explicitly
+    (e.g. a ramdisk mount on macOS or Windows). Otherwise git's many
+    small object/ref writes are fsync-heavy, so tmpfs (/dev/shm) is
+    preferred when it exists; set GITVERSION_TEST_TMPFS=0 to keep
+    repositories on the regular temp directory instead.
+    """
+    override = os.environ.get("GITVERSION_TEST_TMPDIR")
+    if override and os.path.isdir(override):
+        return override
+    if os.environ.get("GITVERSION_TEST_TMPFS", "1") == "0":
+        return None
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+# Base directory for temporary repositories (None means the system default)
+_TMP_BASE = _tmp_base()
+
+# Base git invocation carrying per-command config: the committer identity
+# (so repositories need no config subprocesses), no GPG signing, and no
+# fsync on object writes — durability is pointless for throwaway test
+# repos. Unknown keys (core.fsync needs git >= 2.36) are ignored by
+# older gits rather than rejected.
+_GIT_BASE = (
+    "git",
+    "-c", "user.name=GitVersion Test",
+    "-c", "user.email=test@example.com",
+    "-c", "commit.gpgsign=false",
+    "-c", "core.fsync=none",
+)
+
+# Repositories renamed aside at teardown, deleted in parallel at exit so
+# rmtree of .git object stores stays off each test's critical path
+_TRASH_DIRS = []
+
+
+def cleanup_trash():
+    """Delete trashed repository directories, in parallel when possible.
+
+    Called from the session-finish hook in conftest.py; the atexit
+    registration below is a fallback for non-pytest usage, where thread
+    creation may already be unavailable.
+    """
+    dirs, _TRASH_DIRS[:] = _TRASH_DIRS[:], []
+    if not dirs:
+        return
+    try:
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+            list(pool.map(lambda path: shutil.rmtree(path, ignore_errors=True), dirs))
+    except RuntimeError:
+        # Interpreter is shutting down; delete serially
+        for path in dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+atexit.register(cleanup_trash)
+
 
 class GitEnvironment:
     """Class to manage a temporary Git repository for testing."""
-    
-    def __init__(self, root_dir: Optional[str] = None):
+
+    def __init__(self, root_dir: Optional[str] = None, template: Optional[Path] = None):
         """Initialize a temporary Git repository.
-        
+
         Args:
             root_dir: Optional directory to create the repository in. If None, a temporary directory is created.
+            template: Optional pre-initialized repository to copy instead of running git init.
         """
         self.temp_dir = None
         if root_dir is None:
-            self.temp_dir = tempfile.TemporaryDirectory()
-            self.root_dir = Path(self.temp_dir.name)
+            self.temp_dir = tempfile.mkdtemp(dir=_TMP_BASE)
+            self.root_dir = Path(self.temp_dir)
         else:
             self.root_dir = Path(root_dir)
-            os.makedirs(self.root_dir, exist_ok=True)
-            
-        # Initialize Git repository
-        self._run_git_command("init")
-        
-        # Configure Git user
-        self._run_git_command("config", "user.name", "GitVersion Test")
-        self._run_git_command("config", "user.email", "test@example.com")
+            self.root_dir.mkdir(parents=True, exist_ok=True)
+
+        # Cached result of is_dirty(), invalidated by working-tree mutations
+        self._dirty_cache: Optional[bool] = None
+
+        # Cached results of read-only history queries (short hash, commit
+        # count, describe), invalidated whenever HEAD or the tags change
+        self._query_cache = {}
+
+        # Directories already created via ensure_dir(), to skip repeat stats
+        self._ensured_dirs = set()
+
+        if template is not None:
+            # Clone a pre-initialized repository instead of paying git
+            # init + config + baseline commit subprocesses for every test.
+            # --local avoids pack re-creation, and -c carries the user
+            # identity into the clone (clone does not copy config).
+            subprocess.run(
+                list(_GIT_BASE) + ["clone", "--local", "--no-hardlinks",
+                                   "--quiet", str(template), str(self.root_dir)],
+                check=True,
+                capture_output=True
+            )
+        else:
+            # Initialize Git repository; the user identity rides along as
+            # -c flags on every command, so no config calls are needed
+            self._run_git_command("init", "-q", capture=False)
     
-    def _run_git_command(self, *args) -> str:
+    def _run_git_command(self, *args, capture: bool = True) -> str:
         """Run a Git command in the repository.
-        
+
         Args:
             *args: Git command and arguments
-            
+            capture: Whether to capture stdout. Mutating commands whose
+                output is discarded pass False, skipping the stdout pipe;
+                stderr is always captured for error reporting.
+
         Returns:
-            The command output
+            The command output, or an empty string when capture is False
         """
         result = subprocess.run(
-            ["git"] + list(args),
+            list(_GIT_BASE) + list(args),
             cwd=self.root_dir,
             check=True,
-            capture_output=True,
+            stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True
         )
-        return result.stdout.strip()
+        return result.stdout.strip() if capture else ""
     
+    def fast_import(self, script: str) -> None:
+        """Feed a fast-import stream to the repository.
+
+        Builds commits and tags in a single git process instead of one
+        subprocess per commit/tag.
+
+        Args:
+            script: A git fast-import stream describing blobs, commits and tags
+        """
+        subprocess.run(
+            list(_GIT_BASE) + ["fast-import", "--quiet", "--date-format=now"],
+            cwd=self.root_dir,
+            check=True,
+            capture_output=True,
+            input=script,
+            text=True
+        )
+
+    def build_history(self, history, branch: Optional[str] = None) -> None:
+        """Build a sequence of commits and optional tags in one git process.
+
+        Instead of paying add/commit/rev-parse/tag subprocesses per commit,
+        the whole history is described as a fast-import stream and piped
+        through a single git process (plus one reset to sync the worktree).
+
+        Args:
+            history: Iterable of (files, message, tag) tuples, where files
+                maps file paths to contents and tag may be None
+            branch: The branch to commit to; defaults to the checked-out
+                branch, whatever init.defaultBranch named it
+        """
+        ident = "GitVersion Test <test@example.com> now"
+        parts = []
+        mark = 0
+        if branch is None:
+            # symbolic-ref works on an unborn branch too, so this follows
+            # the repository's default branch name
+            branch = self._run_git_command("symbolic-ref", "--short", "HEAD")
+        # The first commit needs an explicit parent when the branch already
+        # exists; later commits in the stream chain onto it automatically.
+        # rev-parse --verify handles packed refs and the reftable backend,
+        # which a raw .git/refs probe would not.
+        try:
+            self._run_git_command("rev-parse", "--verify", "--quiet",
+                                  f"refs/heads/{branch}", capture=False)
+            first_parent = f"from refs/heads/{branch}^0\n"
+        except subprocess.CalledProcessError:
+            first_parent = ""
+        for files, message, tag_name in history:
+            file_marks = []
+            for path, content in files.items():
+                mark += 1
+                parts.append(f"blob\nmark :{mark}\ndata {len(content.encode('utf-8'))}\n{content}\n")
+                file_marks.append((path, mark))
+            mark += 1
+            parts.append(f"commit refs/heads/{branch}\nmark :{mark}\n"
+                         f"committer {ident}\ndata {len(message.encode('utf-8'))}\n{message}\n")
+            parts.append(first_parent)
+            first_parent = ""
+            for path, blob_mark in file_marks:
+                parts.append(f"M 100644 :{blob_mark} {path}\n")
+            if tag_name:
+                parts.append(f"tag {tag_name}\nfrom :{mark}\ntagger {ident}\ndata 0\n")
+        self.fast_import("".join(parts))
+        # fast-import only writes objects and refs; sync the index and worktree
+        self._run_git_command("reset", "--hard", branch, capture=False)
+        self.invalidate_caches()
+
+    def invalidate_caches(self) -> None:
+        """Drop cached worktree and history state.
+
+        Called after every mutation of the repository, including ones made
+        from outside this class (e.g. CMakeProject writing project files),
+        so is_dirty() and the history queries never return stale results.
+        """
+        self._dirty_cache = None
+        self._query_cache.clear()
+
+    def ensure_dir(self, name: str) -> Path:
+        """Create a directory inside the repository, memoizing the result.
+
+        Args:
+            name: The directory name relative to the repository root
+
+        Returns:
+            The directory path
+        """
+        dir_path = self.root_dir / name
+        if name not in self._ensured_dirs:
+            dir_path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(name)
+        return dir_path
+
     def create_file(self, filename: str, content: str = "") -> None:
         """Create a file in the repository.
-        
+
         Args:
             filename: The file name
             content: The file content
         """
         file_path = self.root_dir / filename
         # ensure directory exists
-        parent_dir = os.path.dirname(file_path)
+        parent_dir = os.path.dirname(filename)
         if parent_dir:  # Only create directory if there's a parent directory
-            os.makedirs(parent_dir, exist_ok=True)
-        with open(file_path, "w", newline='\n') as f:  # Use consistent line endings
-            f.write(content)
+            self.ensure_dir(parent_dir)
+        # Write pre-encoded bytes: skips text-mode newline translation and
+        # keeps line endings consistent across platforms
+        file_path.write_bytes(content.encode("utf-8"))
+        self.invalidate_caches()
     
     def commit(self, message: str = "Test commit") -> str:
         """Create a commit.
@@ -78,8 +260,9 @@ class GitEnvironment:
         Returns:
             The commit hash
         """
-        self._run_git_command("add", ".")
-        self._run_git_command("commit", "-m", message)
+        self._run_git_command("add", ".", capture=False)
+        self._run_git_command("commit", "-m", message, capture=False)
+        self.invalidate_caches()
         return self._run_git_command("rev-parse", "HEAD")
     
     def tag(self, tag_name: str) -> None:
@@ -88,7 +271,8 @@ class GitEnvironment:
         Args:
             tag_name: The tag name
         """
-        self._run_git_command("tag", tag_name)
+        self._run_git_command("tag", tag_name, capture=False)
+        self.invalidate_caches()
     
     def get_commit_count(self) -> int:
         """Get the number of commits in the repository.
@@ -96,7 +280,10 @@ class GitEnvironment:
         Returns:
             The number of commits
         """
-        return int(self._run_git_command("rev-list", "--count", "HEAD"))
+        if "commit_count" not in self._query_cache:
+            self._query_cache["commit_count"] = int(
+                self._run_git_command("rev-list", "--count", "HEAD"))
+        return self._query_cache["commit_count"]
     
     def get_short_hash(self) -> str:
         """Get the short hash of the current commit.
@@ -104,7 +291,10 @@ class GitEnvironment:
         Returns:
             The short hash
         """
-        return self._run_git_command("rev-parse", "--short=9", "HEAD")
+        if "short_hash" not in self._query_cache:
+            self._query_cache["short_hash"] = self._run_git_command(
+                "rev-parse", "--short=9", "HEAD")
+        return self._query_cache["short_hash"]
     
     def debug_git_describe(self, prefix: str = "") -> str:
         """Run git describe command and return the result for debugging.
@@ -115,10 +305,14 @@ class GitEnvironment:
         Returns:
             Command output
         """
-        try:
-            return self._run_git_command("describe", f"--match={prefix}*.*.*", "--tags", "--abbrev=9")
-        except subprocess.CalledProcessError as e:
-            return f"Error: {e.stderr}"
+        key = ("describe", prefix)
+        if key not in self._query_cache:
+            try:
+                self._query_cache[key] = self._run_git_command(
+                    "describe", f"--match={prefix}*.*.*", "--tags", "--abbrev=9")
+            except subprocess.CalledProcessError as e:
+                return f"Error: {e.stderr}"
+        return self._query_cache[key]
     
     def checkout(self, branch_name: str, create: bool = False) -> None:
         """Checkout a branch.
@@ -128,9 +322,10 @@ class GitEnvironment:
             create: Whether to create the branch if it doesn't exist
         """
         if create:
-            self._run_git_command("checkout", "-b", branch_name)
+            self._run_git_command("checkout", "-b", branch_name, capture=False)
         else:
-            self._run_git_command("checkout", branch_name)
+            self._run_git_command("checkout", branch_name, capture=False)
+        self.invalidate_caches()
     
     def modify_file(self, filename: str, content: str = "modified content") -> None:
         """Modify an existing file without committing.
@@ -140,12 +335,19 @@ class GitEnvironment:
             content: The new content to append
         """
         file_path = self.root_dir / filename
-        if file_path.exists():
-            with open(file_path, "a") as f:
-                f.write("\n" + content)
-        else:
+        try:
+            # Append in one raw write: O_APPEND makes the position-to-end
+            # implicit, so no text-layer buffering or seek is involved
+            fd = os.open(file_path, os.O_WRONLY | os.O_APPEND)
+        except OSError:
             # Create new file if it doesn't exist
             self.create_file(filename, content)
+            return
+        try:
+            os.write(fd, b"\n" + content.encode("utf-8"))
+        finally:
+            os.close(fd)
+        self.invalidate_caches()
     
     def is_dirty(self) -> bool:
         """Check if the working directory has uncommitted changes.
@@ -153,11 +355,13 @@ class GitEnvironment:
         Returns:
             True if there are uncommitted changes
         """
-        try:
-            result = self._run_git_command("status", "--porcelain")
-            return bool(result.strip())
-        except subprocess.CalledProcessError:
-            return False
+        if self._dirty_cache is None:
+            try:
+                result = self._run_git_command("status", "--porcelain")
+                self._dirty_cache = bool(result.strip())
+            except subprocess.CalledProcessError:
+                return False
+        return self._dirty_cache
     
     def get_status(self) -> str:
         """Get the Git status.
@@ -171,6 +375,13 @@ class GitEnvironment:
             return f"Error: {e.stderr}"
     
     def __del__(self):
-        """Clean up the temporary directory if created."""
+        """Trash the temporary directory if created; deletion happens at exit."""
         if self.temp_dir:
-            self.temp_dir.cleanup()
+            trash_dir = f"{self.temp_dir}.trash-{uuid.uuid4().hex[:8]}"
+            try:
+                # Rename is near-instant; the expensive rmtree runs in a
+                # thread pool at process exit instead of between tests
+                os.rename(self.temp_dir, trash_dir)
+                _TRASH_DIRS.append(trash_dir)
+            except OSError:
+                shutil.rmtree(self.temp_dir, ignore_errors=True)
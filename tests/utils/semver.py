@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Semantic version parsing helpers for GitVersion.cmake tests.
+"""
+
+import re
+from typing import Optional
+
+# Matches the full version strings GitVersion.cmake produces:
+#   1.2.3, 1.2.3-dirty, 0.0.0+abc123def, 1.2.3-dev.4+abc123def and
+#   1.2.3-dev.4+abc123def.dirty
+# Compiled once at import; a single match replaces several startswith/"in"
+# scans over the same string.
+_FULL_VERSION_RE = re.compile(
+    r"^(?P<base>\d+\.\d+\.\d+)"
+    r"(?:-dev\.(?P<distance>\d+))?"
+    r"(?:\+(?P<hash>[0-9a-f]+))?"
+    r"(?P<dirty>[.-]dirty)?$"
+)
+
+
+def parse_full_version(full_version: str) -> Optional[dict]:
+    """Parse a full version string into its components.
+
+    Args:
+        full_version: The PROJECT_FULL_VERSION string to parse
+
+    Returns:
+        A dict with keys base (str), distance (int or None), hash (str or
+        None) and dirty (bool), or None if the string does not match
+    """
+    m = _FULL_VERSION_RE.match(full_version)
+    if m is None:
+        return None
+    return {
+        "base": m.group("base"),
+        "distance": int(m.group("distance")) if m.group("distance") else None,
+        "hash": m.group("hash"),
+        "dirty": bool(m.group("dirty")),
+    }